@@ -16,16 +16,21 @@
 #
 
 import logging
-from copy import deepcopy
-import ipaddress
+import os
+import re
+import stat
+import pickle
+import socket
 import functools
 from typing import List, Union, Any, Iterable, Tuple, Dict, Type, Optional
 from pathlib import Path
+from copy import deepcopy
 import argparse
 import importlib
 from enum import Enum
 
 from . import config, utils
+from .__metadata__ import __version__
 from .vendor import attr
 from .errors import UnknownParamError, SWUpdateRepoSourceError
 from .pillar import (
@@ -43,11 +48,85 @@ from .serialize import PrvsnrType, loads
 METADATA_PARAM_GROUP_KEY = '_param_group_key'
 METADATA_ARGPARSER = '_param_argparser'
 
+_DASH_TO_UNDERSCORE = str.maketrans('-', '_')
+_UNDERSCORE_TO_DASH = str.maketrans('_', '-')
+
 logger = logging.getLogger(__name__)
 
 
+def _cli_spec_cache_path() -> Path:
+    # NOTE not next to the spec: that is an installed package's data
+    return config.PRVSNR_TMP_DIR / 'cli_spec.yaml.pkl'
+
+
+def _file_stamp(path) -> Tuple[int, int]:
+    st = os.stat(str(path))
+    return (st.st_mtime_ns, st.st_size)
+
+
+def _read_cli_spec_cache(cache_path: Path, spec_path: Path):
+    try:
+        with cache_path.open('rb') as f:
+            version, stamps = pickle.load(f)
+            if (
+                version != __version__
+                or str(spec_path) not in stamps
+                or any(
+                    _file_stamp(path) != stamp
+                    for path, stamp in stamps.items()
+                )
+            ):
+                return None
+            return pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception as exc:
+        logger.debug(f"Failed to read cli spec cache {cache_path}: {exc}")
+        return None
+
+
+def _write_cli_spec_cache(
+    cache_path: Path, stamps: Dict[str, Tuple[int, int]], spec: Dict
+):
+    tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        with tmp_path.open('wb') as f:
+            pickle.dump((__version__, stamps), f)
+            pickle.dump(spec, f)
+        # atomic to not break concurrent readers
+        os.replace(str(tmp_path), str(cache_path))
+    except Exception as exc:
+        # caching is optional
+        logger.debug(f"Failed to write cli spec cache {cache_path}: {exc}")
+        try:
+            tmp_path.unlink()
+        except OSError:
+            pass
+
+
+@functools.lru_cache(maxsize=None)
+def _import_module(mod_name: str):
+    # many cli spec choices usually refer to the same modules
+    return importlib.import_module(mod_name)
+
+
 def load_cli_spec():
-    res = utils.load_yaml(config.CLI_SPEC_PATH)
+    # the spec is cached as a pickle of the already processed data
+    # which is valid for the same package version while mtime and size
+    # of the yaml file and the modules the choices are taken from
+    # are the same
+    spec_path = Path(str(config.CLI_SPEC_PATH))
+    cache_path = _cli_spec_cache_path()
+
+    res = _read_cli_spec_cache(cache_path, spec_path)
+    if res is not None:
+        return res
+
+    stamps = {str(spec_path): _file_stamp(spec_path)}
+    deps = {config.__file__}
+
+    res = utils.load_yaml(spec_path)
 
     def _choices_filter(leaf: utils.DictLeaf):
         return (
@@ -56,26 +135,6 @@ def load_cli_spec():
             and leaf.value.startswith(config.CLI_SPEC_PY_OBJS_PREFIX)
         )
 
-    # convert choices to objects
-    for leaf in utils.iterate_dict(res, filter_f=_choices_filter):
-        choices_spec = leaf.value.split(
-            config.CLI_SPEC_PY_OBJS_PREFIX
-        )[1].split('.')
-
-        mod_name = '.'.join(choices_spec[0:-1])
-        attr_name = choices_spec[-1]
-        module = importlib.import_module(mod_name)
-
-        choices = getattr(module, attr_name)
-
-        try:
-            if issubclass(choices, Enum):
-                choices = [i.value for i in choices]
-        except TypeError:
-            pass  # not a class
-
-        leaf.parent[leaf.key] = choices
-
     def _nohelp_filter(leaf: utils.DictLeaf):
         return (
             leaf.key != 'help'
@@ -83,14 +142,59 @@ def load_cli_spec():
             and isinstance(leaf.value, str)
         )
 
-    # convert trivial descriptions (no help)
-    for leaf in utils.iterate_dict(res, filter_f=_nohelp_filter):
-        leaf.parent[leaf.key] = dict(help=leaf.value)
+    # Note. a single pass: a rewritten leaf is not visited again
+    for leaf in utils.iterate_dict(res):
+        # convert choices to objects
+        if _choices_filter(leaf):
+            choices_spec = leaf.value.split(
+                config.CLI_SPEC_PY_OBJS_PREFIX
+            )[1].split('.')
 
+            mod_name = '.'.join(choices_spec[0:-1])
+            attr_name = choices_spec[-1]
+            module = _import_module(mod_name)
+            deps.add(getattr(module, '__file__', None))
+
+            choices = getattr(module, attr_name)
+
+            try:
+                if issubclass(choices, Enum):
+                    choices = [i.value for i in choices]
+            except TypeError:
+                pass  # not a class
+
+            leaf.parent[leaf.key] = choices
+
+        # convert trivial descriptions (no help)
+        elif _nohelp_filter(leaf):
+            leaf.parent[leaf.key] = dict(help=leaf.value)
+
+    deps.discard(None)  # e.g. namespace packages
+    stamps.update((path, _file_stamp(path)) for path in deps)
+    _write_cli_spec_cache(cache_path, stamps, res)
+
+    return res
+
+
+def _get_cli_spec():
+    # loaded lazily: most of the module's users never need the cli spec
+    res = globals().get('cli_spec')
+    if res is None:
+        res = globals()['cli_spec'] = load_cli_spec()
     return res
 
 
-cli_spec = load_cli_spec()
+def __getattr__(name):
+    # PEP 562 (python 3.7+): lazy module level `cli_spec` attribute
+    if name == 'cli_spec':
+        return _get_cli_spec()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+@functools.lru_cache(maxsize=None)
+def _resolve_cli_spec(key_path: str):
+    # the cli spec is not expected to be changed once loaded
+    return KeyPath(key_path).value(_get_cli_spec())
 
 
 # TODO IMPROVE use some attr api to copy spec
@@ -107,16 +211,22 @@ def copy_attr(_attr, name=None, **changes):
     if not name:
         name = _attr.name
 
-    _utility_type = attr.make_class(
-        "_UtilityType", {
-            name: attr.ib(**attr_kw)
-        }
+    # build the attribute the same way attrs does that for a class
+    # but without creating a throwaway class
+    return attr.Attribute.from_counting_attr(
+        name=name, ca=attr.ib(**attr_kw)
     )
 
-    return attr.fields_dict(_utility_type)[name]
 
+def _copy_default(value):
+    # argparse returns defaults as is, so mutable ones are copied
+    # to not be shared between parsers and with the attrs defaults
+    if isinstance(value, (list, dict, set)):
+        return deepcopy(value)
+    return value
 
-@attr.s(auto_attribs=True)
+
+@attr.s(auto_attribs=True, slots=True)
 class AttrParserArgs:
     _attr: Any  # TODO typing
     prefix: str = attr.ib(default=None)
@@ -126,6 +236,8 @@ class AttrParserArgs:
     metavar: str = attr.ib(init=False, default=None)
     dest: str = attr.ib(init=False, default=None)
     default: str = attr.ib(init=False, default=None)
+    # set if the default value is built by attr.Factory
+    default_factory: Any = attr.ib(init=False, default=None)
     const: str = attr.ib(init=False, default=None)
     choices: List = attr.ib(init=False, default=None)
     help: str = attr.ib(init=False, default='')
@@ -160,12 +272,10 @@ class AttrParserArgs:
         elif self._attr.type is bool:
             self.action = 'store_true'
 
-        self.type = parser_args.get(
-            'type',
-            functools.partial(
-                self.value_from_str, v_type=self._attr.type
-            )
-        )
+        if 'type' in parser_args:
+            self.type = parser_args['type']
+        else:
+            self.type = self._value_parser(self._attr.type)
 
         for arg in ('help', 'dest', 'const'):
             if arg in parser_args:
@@ -183,11 +293,12 @@ class AttrParserArgs:
 
         if self._attr.default is not attr.NOTHING:
             # optional argument
-            self.name = '--' + self.name.replace('_', '-')
+            self.name = '--' + self.name.translate(_UNDERSCORE_TO_DASH)
             # default value for an object (attr) might be more
             # complicated than for a parser
             default_v = parser_args.get('default', self._attr.default)
             if isinstance(default_v, attr.Factory):
+                self.default_factory = default_v
                 default_v = default_v.factory()
             self.default = default_v
             self.metavar = parser_args.get('metavar')
@@ -198,19 +309,27 @@ class AttrParserArgs:
 
     @property
     def kwargs(self):
-        def _filter(_attr, value):
-            not_filter = ['_attr', 'name', 'prefix']
-            if self.action in ('store_true', 'store_false'):
-                not_filter.extend(['metavar', 'type', 'default'])
-            if self.action in ('store_const',):
-                not_filter.extend(['type'])
-            # TODO TEST EOS-8473 nargs
-            for arg in ('choices', 'dest', 'const', 'nargs'):
-                if getattr(self, arg) is None:
-                    not_filter.append(arg)
-            return _attr.name not in not_filter
-
-        return attr.asdict(self, filter=_filter)
+        res = {'action': self.action, 'help': self.help}
+
+        if self.action not in ('store_true', 'store_false'):
+            res['metavar'] = self.metavar
+            res['default'] = _copy_default(self.default)
+            if self.action != 'store_const':
+                res['type'] = self.type
+
+        # TODO TEST EOS-8473 nargs
+        for arg in ('choices', 'dest', 'const', 'nargs'):
+            value = getattr(self, arg)
+            if value is not None:
+                res[arg] = value
+
+        return res
+
+    @classmethod
+    @functools.lru_cache(maxsize=None)
+    def _value_parser(cls, v_type=None):
+        # shared by all the arguments of the same type
+        return functools.partial(cls.value_from_str, v_type=v_type)
 
     @classmethod
     def value_from_str(cls, value, v_type=None):
@@ -224,62 +343,118 @@ class AttrParserArgs:
 
 
 class InputAttrParserArgs(AttrParserArgs):
+    __slots__ = ()
+
     @classmethod
     def value_from_str(cls, value, v_type=None):
         _value = super().value_from_str(value, v_type=v_type)
         return UNCHANGED if _value is None else _value
 
 
+@functools.lru_cache(maxsize=None)
+def _argparser_attrs(cls) -> Tuple[attr.Attribute, ...]:
+    return tuple(
+        _attr for _attr in attr.fields(cls)
+        if METADATA_ARGPARSER in _attr.metadata
+    )
+
+
+# NOTE the cache assumes that attrs metadata of a class is not patched
+#      in runtime, otherwise the related entry should be dropped manually
+#
+#      `attr.Factory` defaults are kept as is there and called
+#      for each result, mutable ones are copied, so parsers never share
+#      default values
+_prepared_args_cache: Dict[
+    Tuple[type, Type[AttrParserArgs]], Dict[str, Dict]
+] = {}
+
+
+def _attr_parser_kwargs(args: AttrParserArgs) -> Dict:
+    res = args.kwargs
+    if 'default' in res and args.default_factory is not None:
+        res['default'] = args.default_factory
+    return res
+
+
+def _copy_prepared_kwargs(kwargs: Dict) -> Dict:
+    res = dict(kwargs)
+    if 'default' in res:
+        default = res['default']
+        res['default'] = (
+            default.factory() if isinstance(default, attr.Factory)
+            else _copy_default(default)
+        )
+    return res
+
+
 class ParserFiller:
     @staticmethod
     def prepare_args(
         cls, attr_parser_cls: Type[AttrParserArgs] = AttrParserArgs
+    ):
+        key = (cls, attr_parser_cls)
+        res = _prepared_args_cache.get(key)
+        if res is None:
+            res = _prepared_args_cache[key] = ParserFiller._prepare_args(
+                cls, attr_parser_cls
+            )
+        # copies to let the callers modify the result
+        return {
+            name: _copy_prepared_kwargs(kwargs)
+            for name, kwargs in res.items()
+        }
+
+    @staticmethod
+    def _prepare_args(
+        cls, attr_parser_cls: Type[AttrParserArgs] = AttrParserArgs
     ):
         res = {}
-        for _attr in attr.fields(cls):
-            if METADATA_ARGPARSER in _attr.metadata:
-                parser_prefix = getattr(cls, 'parser_prefix', None)
-                metadata = _attr.metadata[METADATA_ARGPARSER]
-
-                if isinstance(metadata, str):
-                    metadata = KeyPath(metadata).value(cli_spec)
-                    _attr = copy_attr(
-                        _attr, metadata={
-                            METADATA_ARGPARSER: metadata
+        for _attr in _argparser_attrs(cls):
+            parser_prefix = getattr(cls, 'parser_prefix', None)
+            metadata = _attr.metadata[METADATA_ARGPARSER]
+
+            if isinstance(metadata, str):
+                metadata = _resolve_cli_spec(metadata)
+                _attr = copy_attr(
+                    _attr, metadata={
+                        METADATA_ARGPARSER: metadata
+                    }
+                )
+
+            if metadata.get('action') == 'store_bool':
+                for name, default, m_changes in (
+                    (_attr.name, _attr.default, {
+                        'help': f"enable {metadata['help']}",
+                        'action': 'store_const',
+                        'const': True,
+                        'dest': _attr.name,
+                    }), (f'no{_attr.name}', not _attr.default, {
+                        'help': f"disable {metadata['help']}",
+                        'action': 'store_const',
+                        'const': False,
+                        'dest': _attr.name,
+                    })
+                ):
+                    # nested values are not modified, so a shallow
+                    # copy is enough
+                    metadata_copy = {**metadata, **m_changes}
+                    attr_copy = copy_attr(
+                        _attr, name=name, default=default, metadata={
+                            METADATA_ARGPARSER: metadata_copy
                         }
                     )
-
-                if metadata.get('action') == 'store_bool':
-                    for name, default, m_changes in (
-                        (_attr.name, _attr.default, {
-                            'help': f"enable {metadata['help']}",
-                            'action': 'store_const',
-                            'const': True,
-                            'dest': _attr.name,
-                        }), (f'no{_attr.name}', not _attr.default, {
-                            'help': f"disable {metadata['help']}",
-                            'action': 'store_const',
-                            'const': False,
-                            'dest': _attr.name,
-                        })
-                    ):
-                        metadata_copy = deepcopy(metadata)
-                        metadata_copy.update(m_changes)
-                        attr_copy = copy_attr(
-                            _attr, name=name, default=default, metadata={
-                                METADATA_ARGPARSER: metadata_copy
-                            }
-                        )
-                        args = attr_parser_cls(attr_copy, prefix=parser_prefix)
-                        res[args.name] = args.kwargs
-                else:
-                    args = attr_parser_cls(_attr, prefix=parser_prefix)
-                    res[args.name] = args.kwargs
+                    args = attr_parser_cls(attr_copy, prefix=parser_prefix)
+                    res[args.name] = _attr_parser_kwargs(args)
+            else:
+                args = attr_parser_cls(_attr, prefix=parser_prefix)
+                res[args.name] = _attr_parser_kwargs(args)
 
         return res
 
     @staticmethod
     def fill_parser(cls, parser, attr_parser_cls=AttrParserArgs):
+        # NOTE the single per class cache is the one of prepare_args
         _args = ParserFiller.prepare_args(cls, attr_parser_cls)
         for name, kwargs in _args.items():
             parser.add_argument(name, **kwargs)
@@ -288,29 +463,34 @@ class ParserFiller:
     def extract_args(
         cls, kwargs, positional=True, optional=True, pop=True
     ):
+        parser_attrs = _argparser_attrs(cls)
+        if not parser_attrs:
+            return (), {}, kwargs
+
         _args = {}
         _kwargs = {}
 
         parser_prefix = getattr(cls, 'parser_prefix', '')
 
-        for _attr in attr.fields(cls):
-            if METADATA_ARGPARSER in _attr.metadata:
-                # name = (
-                #     _attr.name.split(parser_prefix, 1)[-1]
-                #     if parser_prefix else _attr.name
-                # )
-                arg_name = f"{parser_prefix}{_attr.name}".replace('-', '_')
-                if arg_name in kwargs:
-                    _dest = None
-                    if positional and _attr.default is attr.NOTHING:
-                        _dest = _args
-                    elif optional and _attr.default is not attr.NOTHING:
-                        _dest = _kwargs
-
-                    if _dest is not None:
-                        _dest[_attr.name] = kwargs[arg_name]
-                        if pop:
-                            kwargs.pop(arg_name)
+        for _attr in parser_attrs:
+            # name = (
+            #     _attr.name.split(parser_prefix, 1)[-1]
+            #     if parser_prefix else _attr.name
+            # )
+            arg_name = (
+                f"{parser_prefix}{_attr.name}".translate(_DASH_TO_UNDERSCORE)
+            )
+            if arg_name in kwargs:
+                _dest = None
+                if positional and _attr.default is attr.NOTHING:
+                    _dest = _args
+                elif optional and _attr.default is not attr.NOTHING:
+                    _dest = _kwargs
+
+                if _dest is not None:
+                    _dest[_attr.name] = kwargs[arg_name]
+                    if pop:
+                        kwargs.pop(arg_name)
 
         return _args.values(), _kwargs, kwargs
 
@@ -343,21 +523,22 @@ class ParserFiller:
         return cls(*_args, **_kwargs), parsed_args
 
 
-@attr.s(auto_attribs=True)
+@attr.s(auto_attribs=True, slots=True)
 class ParserMixin:
 
     parser_prefix = ''
 
     @classmethod
     def parser_attrs(cls):
-        for _attr in attr.fields(cls):
-            if METADATA_ARGPARSER in _attr.metadata:
-                yield _attr
+        yield from _argparser_attrs(cls)
 
     @classmethod
     def parser_args(cls):
         for _attr in cls.parser_attrs():
-            yield f"{cls.parser_prefix}{_attr.name.replace('_', '-')}"
+            yield (
+                f"{cls.parser_prefix}"
+                f"{_attr.name.translate(_UNDERSCORE_TO_DASH)}"
+            )
 
     @classmethod
     def prepare_args(cls, *args, **kwargs):
@@ -372,7 +553,7 @@ class ParserMixin:
         return ParserFiller.from_args(cls, parsed_args, *args, **kwargs)[0]
 
 
-@attr.s(auto_attribs=True)
+@attr.s(auto_attribs=True, slots=True)
 class NoParams:
     @classmethod
     def fill_parser(cls, parser):
@@ -383,6 +564,13 @@ class NoParams:
         return (), kwargs
 
 
+_PILLAR_KEY_BUILDERS = {
+    str: PillarKey,
+    # TODO IMPROVE more checks for tuple types and len
+    tuple: lambda arg: PillarKey(*arg)
+}
+
+
 @attr.s(auto_attribs=True, frozen=True)
 class PillarKeysList:
     _keys: List[PillarKey] = attr.Factory(list)
@@ -400,13 +588,10 @@ class PillarKeysList:
     ):
         pi_keys = []
         for arg in args:
-            if type(arg) is str:
-                pi_keys.append(PillarKey(arg))
-            elif type(arg) is tuple:
-                # TODO IMPROVE more checks for tuple types and len
-                pi_keys.append(PillarKey(*arg))
-            else:
+            builder = _PILLAR_KEY_BUILDERS.get(type(arg))
+            if builder is None:
                 raise TypeError(f"Unexpected type {type(arg)} of args {arg}")
+            pi_keys.append(builder(arg))
         return cls(pi_keys)
 
     @classmethod
@@ -436,9 +621,7 @@ class PillarInputBase(PillarItemsAPI):
         metadata={
             METADATA_ARGPARSER: {
                 'help': 'pillar value',
-                'type': functools.partial(
-                    AttrParserArgs.value_from_str, v_type='json'
-                )
+                'type': AttrParserArgs._value_parser('json')
             }
         }
     )
@@ -485,7 +668,8 @@ class ParamsList:
         params = []
         for param in args:
             key_path = KeyPath(str(param))
-            param = param_spec.get(str(key_path))
+            key_path_str = str(key_path)
+            param = param_spec.get(key_path_str)
             if param is None:
                 param_di = param_spec.get(str(key_path.parent))
                 if isinstance(param_di, ParamDictItem):
@@ -495,9 +679,9 @@ class ParamsList:
                     )
                 else:
                     logger.error(
-                        "Unknown param {}".format(key_path)
+                        "Unknown param {}".format(key_path_str)
                     )
-                    raise UnknownParamError(str(key_path))
+                    raise UnknownParamError(key_path_str)
             params.append(param)
         return cls(params)
 
@@ -513,21 +697,30 @@ class ParamsList:
         return (), kwargs
 
 
+@functools.lru_cache(maxsize=None)
+def _attr_names(cls) -> Tuple[str, ...]:
+    return tuple(_attr.name for _attr in attr.fields(cls))
+
+
 class ParamGroupInputBase(PillarItemsAPI):
+    __slots__ = ()
+
     _param_group = None
     _spec = None
 
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # each class has its own cache of params specs
+        cls._spec = {}
+
     def pillar_items(self):  # TODO return type
-        res = {}
-        for attr_name in attr.fields_dict(type(self)):
-            res[self.param_spec(attr_name)] = getattr(self, attr_name)
-        return iter(res.items())
+        for attr_name in _attr_names(type(self)):
+            yield self.param_spec(attr_name), getattr(self, attr_name)
 
     @classmethod
     def param_spec(cls, attr_name: str):
-        if cls._spec is None:
-            cls._spec = {}
-        if attr_name not in cls._spec:
+        res = cls._spec.get(attr_name)
+        if res is None:
             try:
                 _attr = attr.fields_dict(cls)[attr_name]
             except KeyError:
@@ -540,8 +733,8 @@ class ParamGroupInputBase(PillarItemsAPI):
                     "{}/{}".format(param_group, attr_name) if param_group
                     else attr_name
                 )
-                cls._spec[attr_name] = param_spec[full_path]
-        return cls._spec[attr_name]
+                res = cls._spec[attr_name] = param_spec[full_path]
+        return res
 
     @classmethod
     def from_args(cls, *args, **kwargs):
@@ -572,25 +765,30 @@ class ParamGroupInputBase(PillarItemsAPI):
         )
 
 
+# values that are not validated as ip4 addresses
+# (in addition to UNCHANGED and empty ones)
+_IP4_CHECK_SKIP = ('None', '\"\"')  # FIXME JBOD
+
+
 class Validation():
     @staticmethod
     def check_ip4(instace, attribute, value):
+        if not value or value is UNCHANGED or value in _IP4_CHECK_SKIP:
+            return
+
         try:
-            ip = None
-            if (
-                value and
-                value != UNCHANGED and
-                value != 'None' and
-                value != '\"\"'
-            ):  # FIXME JBOD
-                ip = ipaddress.IPv4Address(value)
-                # TODO : Improve logic internally convert ip to
-                # canonical forms.
-                if str(ip) != value:
-                    raise ValueError(
-                        "IP is not in canonical form."
-                        f"Canonical form of IP can be {str(ip)}"
-                    )
+            try:
+                packed = socket.inet_pton(socket.AF_INET, value)
+            except (OSError, TypeError) as exc:
+                raise ValueError(str(exc))
+            # TODO : Improve logic internally convert ip to
+            # canonical forms.
+            canonical = socket.inet_ntoa(packed)
+            if canonical != value:
+                raise ValueError(
+                    "IP is not in canonical form."
+                    f"Canonical form of IP can be {canonical}"
+                )
         except ValueError as exc:
             raise ValueError(
                 f"{attribute.name}: invalid ip4 address {value} "
@@ -598,101 +796,107 @@ class Validation():
             )
 
 
-@attr.s(auto_attribs=True)
-class NTP(ParamGroupInputBase):
-    _param_group = 'ntp'
-    # TODO some trick to avoid passing that value
-    server: str = ParamGroupInputBase._attr_ib(
-        _param_group, descr="ntp server ip"
-    )
-    timezone: str = ParamGroupInputBase._attr_ib(
-        _param_group, descr="ntp server timezone"
+def _param_group_cls(
+    cls_name: str, param_group: str, params: Dict[str, Dict]
+) -> Type[ParamGroupInputBase]:
+    # params are a mapping of attribute names
+    # to `ParamGroupInputBase._attr_ib` kwargs
+    cls = attr.make_class(
+        cls_name,
+        {
+            attr_name: ParamGroupInputBase._attr_ib(param_group, **kwargs)
+            for attr_name, kwargs in params.items()
+        },
+        bases=(ParamGroupInputBase,),
+        slots=True
     )
+    cls._param_group = param_group
+    cls.__module__ = __name__
+    return cls
 
 
-@attr.s(auto_attribs=True)
-class Hostname(ParamGroupInputBase):
-    _param_group = 'hostname'
-    hostname: str = ParamGroupInputBase._attr_ib(
-        _param_group, descr="hostname to be set"
-    )
+NTP = _param_group_cls('NTP', 'ntp', {
+    'server': dict(type=str, descr="ntp server ip"),
+    'timezone': dict(type=str, descr="ntp server timezone"),
+})
 
 
-@attr.s(auto_attribs=True)
-class Firewall(ParamGroupInputBase):
-    _param_group = 'firewall'
+Hostname = _param_group_cls('Hostname', 'hostname', {
+    'hostname': dict(type=str, descr="hostname to be set"),
+})
 
 
-@attr.s(auto_attribs=True)
-class MgmtNetwork(ParamGroupInputBase):
-    _param_group = 'mgmt_network'
-    mgmt_gateway: str = ParamGroupInputBase._attr_ib(
-        _param_group, descr="node mgmt gateway IP",
-        validator=Validation.check_ip4
-    )
-    mgmt_public_ip: str = ParamGroupInputBase._attr_ib(
-        _param_group, descr="node management interface IP",
-        validator=Validation.check_ip4
-    )
-    mgmt_netmask: str = ParamGroupInputBase._attr_ib(
-        _param_group, descr="node management interface netmask",
-        validator=Validation.check_ip4
-    )
-    mgmt_interfaces: List = ParamGroupInputBase._attr_ib(
-        _param_group, descr="node management network interfaces"
-    )
-    mgmt_mtu: str = ParamGroupInputBase._attr_ib(
-        _param_group, descr="node management network mtu",
-        default=1500
-    )
+Firewall = _param_group_cls('Firewall', 'firewall', {})
 
 
-@attr.s(auto_attribs=True)
-class PublicDataNetwork(ParamGroupInputBase):
-    _param_group = 'public_data_network'
-    data_public_ip: str = ParamGroupInputBase._attr_ib(
-        _param_group, descr="node public data interface IP",
+MgmtNetwork = _param_group_cls('MgmtNetwork', 'mgmt_network', {
+    'mgmt_gateway': dict(
+        type=str, descr="node mgmt gateway IP",
         validator=Validation.check_ip4
-    )
-    data_gateway: str = ParamGroupInputBase._attr_ib(
-        _param_group, descr="node data gateway IP",
+    ),
+    'mgmt_public_ip': dict(
+        type=str, descr="node management interface IP",
         validator=Validation.check_ip4
-    )
-    data_netmask: str = ParamGroupInputBase._attr_ib(
-        _param_group, descr="node data interface netmask",
+    ),
+    'mgmt_netmask': dict(
+        type=str, descr="node management interface netmask",
         validator=Validation.check_ip4
-    )
-    data_public_interfaces: List = ParamGroupInputBase._attr_ib(
-        _param_group, descr="node public data network interfaces"
-    )
-    data_mtu: str = ParamGroupInputBase._attr_ib(
-        _param_group, descr="node data network mtu",
-        default=1500
-    )
+    ),
+    'mgmt_interfaces': dict(
+        type=List, descr="node management network interfaces"
+    ),
+    'mgmt_mtu': dict(
+        type=str, descr="node management network mtu", default=1500
+    ),
+})
+
+
+PublicDataNetwork = _param_group_cls(
+    'PublicDataNetwork', 'public_data_network', {
+        'data_public_ip': dict(
+            type=str, descr="node public data interface IP",
+            validator=Validation.check_ip4
+        ),
+        'data_gateway': dict(
+            type=str, descr="node data gateway IP",
+            validator=Validation.check_ip4
+        ),
+        'data_netmask': dict(
+            type=str, descr="node data interface netmask",
+            validator=Validation.check_ip4
+        ),
+        'data_public_interfaces': dict(
+            type=List, descr="node public data network interfaces"
+        ),
+        'data_mtu': dict(
+            type=str, descr="node data network mtu", default=1500
+        ),
+    }
+)
 
 
-@attr.s(auto_attribs=True)
-class PrivateDataNetwork(ParamGroupInputBase):
-    _param_group = 'private_data_network'
-    data_private_ip: str = ParamGroupInputBase._attr_ib(
-        _param_group, descr="node private data interface IP",
-        validator=Validation.check_ip4
-    )
-    data_private_interfaces: List = ParamGroupInputBase._attr_ib(
-        _param_group, descr="node private data network interfaces"
-    )
-    data_mtu: str = ParamGroupInputBase._attr_ib(
-        _param_group, descr="node data network mtu",
-        default=1500
-    )
-    data_gateway: str = ParamGroupInputBase._attr_ib(
-        _param_group, descr="node data gateway IP",
-        validator=Validation.check_ip4
-    )
-    data_netmask: str = ParamGroupInputBase._attr_ib(
-        _param_group, descr="node data interface netmask",
-        validator=Validation.check_ip4
-    )
+PrivateDataNetwork = _param_group_cls(
+    'PrivateDataNetwork', 'private_data_network', {
+        'data_private_ip': dict(
+            type=str, descr="node private data interface IP",
+            validator=Validation.check_ip4
+        ),
+        'data_private_interfaces': dict(
+            type=List, descr="node private data network interfaces"
+        ),
+        'data_mtu': dict(
+            type=str, descr="node data network mtu", default=1500
+        ),
+        'data_gateway': dict(
+            type=str, descr="node data gateway IP",
+            validator=Validation.check_ip4
+        ),
+        'data_netmask': dict(
+            type=str, descr="node data interface netmask",
+            validator=Validation.check_ip4
+        ),
+    }
+)
 
 
 class ReleaseParams():
@@ -702,7 +906,7 @@ class ReleaseParams():
     )
 
 
-@attr.s(auto_attribs=True)
+@attr.s(auto_attribs=True, slots=True)
 class Release(ParamGroupInputBase):
     target_build: str = ReleaseParams.target_build
 
@@ -735,7 +939,7 @@ class StorageEnclosureParams():
     )
 
 
-@attr.s(auto_attribs=True)
+@attr.s(auto_attribs=True, slots=True)
 class StorageEnclosure(ParamGroupInputBase):
     controller_a_ip: str = StorageEnclosureParams.primary_ip
     controller_b_ip: str = StorageEnclosureParams.secondary_ip
@@ -902,7 +1106,7 @@ class NetworkParams():
     )
 
 
-@attr.s(auto_attribs=True)
+@attr.s(auto_attribs=True, slots=True, frozen=True)
 class Network(ParamGroupInputBase):
     cluster_ip: str = NetworkParams.cluster_ip
     mgmt_vip: str = NetworkParams.mgmt_vip
@@ -965,16 +1169,16 @@ class ParamDictItemInputBase(PrvsnrType, PillarItemsAPI):
     _param = None
 
     def pillar_items(self):  # TODO return type
-        return iter({
-            self.param_spec(): getattr(self, self._param_di.value)
-        }.items())
+        return iter((
+            (self.param_spec(), getattr(self, self._param_di.value)),
+        ))
 
     def param_spec(self):
         if self._param is None:
-            key = getattr(self, self._param_di.key)
+            param_di = self._param_di
+            key = getattr(self, param_di.key)
             self._param = Param(
-                self._param_di.name / key,
-                (self._param_di.keypath / key, self._param_di.fpath)
+                param_di.name / key, (param_di.keypath / key, param_di.fpath)
             )
         return self._param
 
@@ -1006,7 +1210,28 @@ class ParamDictItemInputBase(PrvsnrType, PillarItemsAPI):
         )
 
 
-@attr.s(auto_attribs=True)
+# urls are expected to start with one of these
+_URL_SCHEMES = ('http://', 'https://')
+
+
+def _source_converter(value):
+    if value is None:
+        return UNCHANGED
+    return (
+        value if is_special(value) or isinstance(value, Path) else str(value)
+    )
+
+
+class _RepoSourceKind(Enum):
+    SPECIAL = 'special'
+    REMOTE = 'remote'
+    DIR = 'dir'
+    ISO = 'iso'
+    # a local path that is neither a file nor a directory (for now)
+    LOCAL = 'local'
+
+
+@attr.s(auto_attribs=True, eq=False)
 class SWUpdateRepo(ParamDictItemInputBase):
     _param_di = param_spec['swupdate/repo']
     release: str = ParamDictItemInputBase._attr_ib(
@@ -1021,11 +1246,7 @@ class SWUpdateRepo(ParamDictItemInputBase):
             .format(UNDEFINED)
         ),
         metavar='str',
-        converter=lambda v: (
-            UNCHANGED if v is None else (
-                v if is_special(v) or isinstance(v, Path) else str(v)
-            )
-        )
+        converter=_source_converter
     )
     _repo_params: Dict = attr.ib(init=False, default=attr.Factory(dict))
     _metadata: Dict = attr.ib(init=False, default=attr.Factory(dict))
@@ -1035,22 +1256,22 @@ class SWUpdateRepo(ParamDictItemInputBase):
         if is_special(value):
             return  # TODO does any special is expected here
 
-        if (
-            type(self.source) is str
-            and value.startswith(('http://', 'https://'))
-        ):
+        if isinstance(value, str) and value.startswith(_URL_SCHEMES):
             return
 
         reason = None
         _value = Path(str(value))
-        if _value.exists():
-            if _value.is_file():
+        try:
+            # a single stat call instead of exists/is_file/is_dir ones
+            mode = os.stat(str(_value)).st_mode
+        except (FileNotFoundError, NotADirectoryError):
+            reason = 'unexpected type of source'
+        else:
+            if stat.S_ISREG(mode):
                 if _value.suffix != '.iso':
                     reason = 'not an iso file'
-            elif not _value.is_dir():
+            elif not stat.S_ISDIR(mode):
                 reason = 'not a file or directory'
-        else:
-            reason = 'unexpected type of source'
 
         if reason:
             logger.error(
@@ -1061,8 +1282,8 @@ class SWUpdateRepo(ParamDictItemInputBase):
 
     def __attrs_post_init__(self):
         if (
-            type(self.source) is str
-            and not self.source.startswith(('http://', 'https://'))
+            isinstance(self.source, str)
+            and not self.source.startswith(_URL_SCHEMES)
         ):
             self.source = Path(self.source)
 
@@ -1075,10 +1296,11 @@ class SWUpdateRepo(ParamDictItemInputBase):
 
     @property
     def pillar_value(self):
-        if self.is_special() or self.is_remote():
+        kind = self._source_kind()
+        if kind in (_RepoSourceKind.SPECIAL, _RepoSourceKind.REMOTE):
             return self.source
         else:
-            source = 'iso' if self.source.is_file() else 'dir'
+            source = 'iso' if kind is _RepoSourceKind.ISO else 'dir'
             if self._repo_params:
                 return {
                     'source': source,
@@ -1103,6 +1325,27 @@ class SWUpdateRepo(ParamDictItemInputBase):
     def metadata(self, metadata: Dict):
         self._metadata = metadata
 
+    def _source_kind(self) -> _RepoSourceKind:
+        # NOTE not cached: the result reflects the current source
+        #      and file system state, at most one stat call is made
+        source = self.source
+        if is_special(source):
+            return _RepoSourceKind.SPECIAL
+        elif not isinstance(source, Path):
+            return _RepoSourceKind.REMOTE
+
+        try:
+            mode = os.stat(str(source)).st_mode
+        except (FileNotFoundError, NotADirectoryError):
+            return _RepoSourceKind.LOCAL
+
+        if stat.S_ISREG(mode):
+            return _RepoSourceKind.ISO
+        elif stat.S_ISDIR(mode):
+            return _RepoSourceKind.DIR
+        else:
+            return _RepoSourceKind.LOCAL
+
     def is_special(self):
         return is_special(self.source)
 
@@ -1113,13 +1356,27 @@ class SWUpdateRepo(ParamDictItemInputBase):
         return not (self.is_special() or self.is_local())
 
     def is_dir(self):
-        return self.is_local() and self.source.is_dir()
+        return self._source_kind() is _RepoSourceKind.DIR
 
     def is_iso(self):
-        return self.is_local() and self.source.is_file()
+        return self._source_kind() is _RepoSourceKind.ISO
 
 
-@attr.s(auto_attribs=True)
+# repos of a release with no sources, the release itself is added at runtime
+_EMPTY_REPOS_TMPL = dict.fromkeys((
+    config.OS_ISO_DIR,
+    config.CORTX_ISO_DIR,
+    config.CORTX_3RD_PARTY_ISO_DIR,
+    config.CORTX_PYTHON_ISO_DIR
+))
+
+
+def _empty_repo_map(release: str) -> Dict:
+    # NOTE a new dict each call since callers might modify it
+    return {**_EMPTY_REPOS_TMPL, release: None}
+
+
+@attr.s(auto_attribs=True, eq=False)
 class SWUpgradeRepo(SWUpdateRepo):
     source: Union[str, Path] = ParamDictItemInputBase._attr_ib(
         descr=(
@@ -1130,11 +1387,7 @@ class SWUpgradeRepo(SWUpdateRepo):
         ),
         is_key=True,
         metavar='str',
-        converter=lambda v: (
-            UNCHANGED if v is None else (
-                v if is_special(v) or isinstance(v, Path) else str(v)
-            )
-        )
+        converter=_source_converter
     )
     release: str = ParamDictItemInputBase._attr_ib(
         descr="release version",
@@ -1211,6 +1464,7 @@ class SWUpgradeRepo(SWUpdateRepo):
     def _pillar_values_ver1(self):
         # source = 'iso' if self.source.is_file() else 'dir'
         iso_dir = config.PRVSNR_USER_FILES_SWUPGRADE_REPOS_DIR
+        prefix = f'file://{self.target_build}/{self.release}'
         return {
             f'{self.release}': {
                 'source': f'salt://{iso_dir}/{self.release}.iso',
@@ -1218,28 +1472,24 @@ class SWUpgradeRepo(SWUpdateRepo):
                 'is_repo': False
             },
             f'{config.OS_ISO_DIR}': {
-                'source': (f'file://{self.target_build}/{self.release}/'
-                           f'{config.OS_ISO_DIR}'),
+                'source': f'{prefix}/{config.OS_ISO_DIR}',
                 'is_repo': True,
                 # FIXME upgrade iso currently may lack repodata
                 # 'enabled': self.enabled
                 'enabled': False
             },
             f'{config.CORTX_ISO_DIR}': {
-                'source': (f'file://{self.target_build}/{self.release}/'
-                           f'{config.CORTX_ISO_DIR}'),
+                'source': f'{prefix}/{config.CORTX_ISO_DIR}',
                 'is_repo': True,
                 'enabled': self.enabled
             },
             f'{config.CORTX_3RD_PARTY_ISO_DIR}': {
-                'source': (f'file://{self.target_build}/{self.release}/'
-                           f'{config.CORTX_3RD_PARTY_ISO_DIR}'),
+                'source': f'{prefix}/{config.CORTX_3RD_PARTY_ISO_DIR}',
                 'is_repo': True,
                 'enabled': self.enabled
             },
             f'{config.CORTX_PYTHON_ISO_DIR}': {
-                'source': f'file://{self.target_build}/{self.release}/'
-                          f'{config.CORTX_PYTHON_ISO_DIR}',
+                'source': f'{prefix}/{config.CORTX_PYTHON_ISO_DIR}',
                 'is_repo': False
             }
         }
@@ -1254,6 +1504,12 @@ class SWUpgradeRepo(SWUpdateRepo):
         """
         # source = 'iso' if self.source.is_file() else 'dir'
         iso_dir = config.PRVSNR_USER_FILES_SWUPGRADE_REPOS_DIR
+        prefix = f'file://{self.target_build}/{self.release}'
+        sw_prefix = f'{prefix}/{config.ISOKeywordsVer2.SW}'
+        rpm_prefix = (
+            f'{sw_prefix}/{config.ISOKeywordsVer2.EXTERNAL}/'
+            f'{config.ISOKeywordsVer2.RPM}'
+        )
         return {
             f'{self.release}': {
                 'source': f'salt://{iso_dir}/{self.release}.iso',
@@ -1261,53 +1517,39 @@ class SWUpgradeRepo(SWUpdateRepo):
                 'is_repo': False
             },
             f'{config.ISOKeywordsVer2.FW}': {
-                'source': (f'file://{self.target_build}/{self.release}/'
-                           f'{config.ISOKeywordsVer2.FW}'),
+                'source': f'{prefix}/{config.ISOKeywordsVer2.FW}',
                 'is_repo': False,  # fw is not a repo
                 'enabled': self.enabled
             },
             f'{config.ISOKeywordsVer2.OS}': {
-                'source': (f'file://{self.target_build}/{self.release}/'
-                           f'{config.ISOKeywordsVer2.OS}'),
+                'source': f'{prefix}/{config.ISOKeywordsVer2.OS}',
                 'is_repo': False,  # os contains only system patches
                 'enabled': self.enabled
             },
             f'{config.UpgradeReposVer2.CORTX.value}': {
-                'source': (f'file://{self.target_build}/{self.release}/'
-                           f'{config.ISOKeywordsVer2.SW}/'
+                'source': (f'{sw_prefix}/'
                            f'{config.UpgradeReposVer2.CORTX.value}'),
                 'is_repo': True,
                 'enabled': self.enabled
             },
             f'{config.ISOKeywordsVer2.PYTHON}': {
-                'source': f'file://{self.target_build}/{self.release}/'
-                          f'{config.ISOKeywordsVer2.SW}/'
-                          f'{config.ISOKeywordsVer2.EXTERNAL}/'
+                'source': f'{sw_prefix}/{config.ISOKeywordsVer2.EXTERNAL}/'
                           f'{config.ISOKeywordsVer2.PYTHON}',
                 'is_repo': False
             },
             f'{config.UpgradeReposVer2.EPEL_7.value}': {
-                'source': f'file://{self.target_build}/{self.release}/'
-                          f'{config.ISOKeywordsVer2.SW}/'
-                          f'{config.ISOKeywordsVer2.EXTERNAL}/'
-                          f'{config.ISOKeywordsVer2.RPM}/'
-                          f'{config.UpgradeReposVer2.EPEL_7.value}',
+                'source': (f'{rpm_prefix}/'
+                           f'{config.UpgradeReposVer2.EPEL_7.value}'),
                 'is_repo': True
             },
             f'{config.UpgradeReposVer2.COMMONS.value}': {
-                'source': f'file://{self.target_build}/{self.release}/'
-                          f'{config.ISOKeywordsVer2.SW}/'
-                          f'{config.ISOKeywordsVer2.EXTERNAL}/'
-                          f'{config.ISOKeywordsVer2.RPM}/'
-                          f'{config.UpgradeReposVer2.COMMONS.value}',
+                'source': (f'{rpm_prefix}/'
+                           f'{config.UpgradeReposVer2.COMMONS.value}'),
                 'is_repo': True
             },
             f'{config.UpgradeReposVer2.PERFORMANCE.value}': {
-                'source': f'file://{self.target_build}/{self.release}/'
-                          f'{config.ISOKeywordsVer2.SW}/'
-                          f'{config.ISOKeywordsVer2.EXTERNAL}/'
-                          f'{config.ISOKeywordsVer2.RPM}/'
-                          f'{config.UpgradeReposVer2.PERFORMANCE.value}',
+                'source': (f'{rpm_prefix}/'
+                           f'{config.UpgradeReposVer2.PERFORMANCE.value}'),
                 'is_repo': True
             }
         }
@@ -1320,38 +1562,30 @@ class SWUpgradeRepo(SWUpdateRepo):
     @property
     def pillar_value(self):
         if self.is_special():
-            res = {
-                f"{repo}": None
-                for repo in (config.OS_ISO_DIR,
-                             config.CORTX_ISO_DIR,
-                             config.CORTX_3RD_PARTY_ISO_DIR,
-                             config.CORTX_PYTHON_ISO_DIR)
-            }
-            res[self.release] = None
-
-            return res
+            return _empty_repo_map(self.release)
         elif self.is_remote():
             # TODO: EOS-20669: Need to save version of remote repo structure,
             #  e.g. self.source_version.
+            prefix = self.source
+            enabled = self.enabled
             return {
                 f'{config.OS_ISO_DIR}': {
-                    'source': f'{self.source}/{config.OS_ISO_DIR}',
+                    'source': f'{prefix}/{config.OS_ISO_DIR}',
                     'is_repo': True,
-                    'enabled': self.enabled
+                    'enabled': enabled
                 },
                 f'{config.CORTX_ISO_DIR}': {
-                    'source': f'{self.source}/{config.CORTX_ISO_DIR}',
+                    'source': f'{prefix}/{config.CORTX_ISO_DIR}',
                     'is_repo': True,
-                    'enabled': self.enabled
+                    'enabled': enabled
                 },
                 f'{config.CORTX_3RD_PARTY_ISO_DIR}': {
-                    'source': (f'{self.source}/'
-                               f'{config.CORTX_3RD_PARTY_ISO_DIR}'),
+                    'source': f'{prefix}/{config.CORTX_3RD_PARTY_ISO_DIR}',
                     'is_repo': True,
-                    'enabled': self.enabled
+                    'enabled': enabled
                 },
                 f'{config.CORTX_PYTHON_ISO_DIR}': {
-                    'source': f'{self.source}/{config.CORTX_PYTHON_ISO_DIR}',
+                    'source': f'{prefix}/{config.CORTX_PYTHON_ISO_DIR}',
                     'is_repo': False
                 }
             }
@@ -1361,16 +1595,33 @@ class SWUpgradeRepo(SWUpdateRepo):
                     else self._pillar_values_ver2)
 
 
+# TODO: It is the rough version of regex because we didn't have the
+#  final representation of the release version from the RE team.
+_RELEASE_RE = re.compile(r"[0-9]+\.[0-9]+\.[0-9]+-[0-9]+\Z", re.ASCII)
+
+
+# the same few releases are usually validated over and over
+@functools.lru_cache(maxsize=256)
+def _is_release(value: str) -> bool:
+    return _RELEASE_RE.match(value) is not None
+
+
+def _validator_release(instance, attribute, value):
+    if not _is_release(value):
+        raise ValueError(
+            "'{}' must match regex {!r} ({!r} doesn't)"
+            .format(attribute.name, _RELEASE_RE.pattern, value),
+            attribute, _RELEASE_RE, value
+        )
+
+
 @attr.s(auto_attribs=True)
 class SWUpgradeRemoveRepo(ParamDictItemInputBase):
     _param_di = param_spec['swupgrade/repo']
     release: str = ParamDictItemInputBase._attr_ib(
         is_key=True,
         descr="release version",
-        # TODO: It is the rough version of regex because we didn't have the
-        #  final representation of the release version from the RE team.
-        validator=attr.validators.matches_re(
-            r"^[0-9]+\.[0-9]+\.[0-9]+\-[0-9]+$"),
+        validator=_validator_release,
         converter=str
     )
 
@@ -1381,13 +1632,4 @@ class SWUpgradeRemoveRepo(ParamDictItemInputBase):
 
     @property
     def pillar_value(self):
-        res = {
-            f"{repo}": None
-            for repo in (config.OS_ISO_DIR,
-                         config.CORTX_ISO_DIR,
-                         config.CORTX_3RD_PARTY_ISO_DIR,
-                         config.CORTX_PYTHON_ISO_DIR,
-                         self.release)
-        }
-
-        return res
+        return _empty_repo_map(self.release)
@@ -134,6 +134,8 @@ class PillarKey(PillarKeyAPI):
 
 
 class PillarItemsAPI(ABC):
+    __slots__ = ()
+
     @abstractmethod
     def pillar_items(self) -> Iterable[Tuple[PillarKeyAPI, Any]]:
         ...
@@ -50,6 +50,12 @@ from .vendor import attr
 
 logger = logging.getLogger(__name__)
 
+try:
+    # libyaml based loader, much faster than the pure python one
+    from yaml import CSafeLoader as YamlSafeLoader
+except ImportError:
+    from yaml import SafeLoader as YamlSafeLoader
+
 
 # https://www.gnu.org/software/tar/
 TAR_VER_WITH_SORT_OPT = '1.28'
@@ -177,7 +183,7 @@ def validator__subclass_of(
 
 
 def load_yaml_str(data):
-    return yaml.safe_load(data)
+    return yaml.load(data, Loader=YamlSafeLoader)
 
 
 def dump_yaml_str(
@@ -18,15 +18,16 @@
 import pytest
 from unittest.mock import call
 import argparse
+import json
 from typing import Union, List
 from pathlib import Path
 import functools
 
 from provisioner.vendor import attr
 from provisioner.errors import SWUpdateRepoSourceError
-from provisioner import values
-from provisioner.values import UNCHANGED
-from provisioner import inputs
+from provisioner import values, config
+from provisioner.values import UNCHANGED, UNDEFINED
+from provisioner import inputs, serialize
 from provisioner.param import (
     Param, ParamDictItem
 )
@@ -42,6 +43,8 @@ from provisioner.inputs import (
     NTP, Network, NetworkParams,
     ParamDictItemInputBase,
     SWUpdateRepo,
+    SWUpgradeRepo,
+    SWUpgradeRemoveRepo,
     ParserFiller
 )
 from provisioner.pillar import PillarKey
@@ -95,6 +98,75 @@ def param_spec_mocked(monkeypatch, param_spec):
     return param_spec
 
 
+# ### load_cli_spec ###
+
+def test_inputs_load_cli_spec_cache(monkeypatch, mocker, tmpdir_function):
+    spec_path = tmpdir_function / 'cli_spec.yaml'
+    spec_path.write_text(
+        "group:\n"
+        "  arg1: some help\n"
+        "  arg2:\n"
+        "    help: other help\n"
+        "    choices: __py__:provisioner.config.DistrType\n"
+    )
+    cache_dir = tmpdir_function / 'cache'
+    monkeypatch.setattr(inputs.config, 'CLI_SPEC_PATH', spec_path)
+    monkeypatch.setattr(inputs.config, 'PRVSNR_TMP_DIR', cache_dir)
+
+    expected = {
+        'group': {
+            'arg1': {'help': 'some help'},
+            'arg2': {'help': 'other help', 'choices': ['cortx', 'bundle']}
+        }
+    }
+    assert inputs.load_cli_spec() == expected
+    assert (cache_dir / 'cli_spec.yaml.pkl').exists()
+    assert not (tmpdir_function / 'cli_spec.yaml.pkl').exists()
+
+    # cache is invalidated once the spec is changed
+    spec_path.write_text("arg3: new help\n")
+    expected = {'arg3': {'help': 'new help'}}
+    assert inputs.load_cli_spec() == expected
+
+    load_yaml_m = mocker.spy(inputs.utils, 'load_yaml')
+    assert inputs.load_cli_spec() == expected
+    load_yaml_m.assert_not_called()
+
+    # as well as for another package version
+    monkeypatch.setattr(inputs, '__version__', 'some-other-version')
+    assert inputs.load_cli_spec() == expected
+    assert load_yaml_m.call_count == 1
+
+
+def test_inputs_load_cli_spec_cache_choices_module_changed(
+    monkeypatch, mocker, tmpdir_function
+):
+    mod_path = tmpdir_function / 'some_choices_mod.py'
+    mod_path.write_text("CHOICES = ['a', 'b']\n")
+    monkeypatch.syspath_prepend(str(tmpdir_function))
+
+    spec_path = tmpdir_function / 'cli_spec.yaml'
+    spec_path.write_text(
+        "arg:\n"
+        "  help: some help\n"
+        "  choices: __py__:some_choices_mod.CHOICES\n"
+    )
+    monkeypatch.setattr(inputs.config, 'CLI_SPEC_PATH', spec_path)
+    monkeypatch.setattr(
+        inputs.config, 'PRVSNR_TMP_DIR', tmpdir_function / 'cache'
+    )
+
+    inputs.load_cli_spec()
+
+    load_yaml_m = mocker.spy(inputs.utils, 'load_yaml')
+    inputs.load_cli_spec()
+    load_yaml_m.assert_not_called()
+
+    mod_path.write_text("CHOICES = ['a', 'b', 'c']\n")
+    inputs.load_cli_spec()
+    load_yaml_m.assert_called_once_with(spec_path)
+
+
 # AttrParserArgs tests
 
 
@@ -105,6 +177,17 @@ def test_inputs_AttrParserArgs_kwargs_keys_by_default():
     ) == set(('action', 'metavar', 'default', 'help', 'type'))
 
 
+def test_inputs_AttrParserArgs_kwargs_mutable_default_copied():
+    some_list = ['some-value']
+    SC = attr.make_class("SC", {"x": attr.ib(type=List, default=some_list)})
+    args = AttrParserArgs(attr.fields(SC).x)
+
+    default = args.kwargs['default']
+    assert default == some_list
+    assert default is not some_list
+    assert args.kwargs['default'] is not default
+
+
 def test_attr_parser_args_kwargs_keys_with_choices():
     SC = attr.make_class("SC", {
         "x": attr.ib(type=str, default='123', metadata={
@@ -544,6 +627,25 @@ def test_inputs_NETWORK():
             assert fattr.default is UNCHANGED
 
 
+# ### Validation ###
+
+def test_inputs_Validation_check_ip4():
+    fattr = attr.fields(inputs.MgmtNetwork).mgmt_gateway
+
+    for value in (None, '', UNCHANGED, 'None', '""', '192.168.0.1'):
+        inputs.Validation.check_ip4(None, fattr, value)
+
+    for value in (
+        'some-host', '192.168.0', '192.168.0.256', '192.168.0.01',
+        ' 192.168.0.1', 3232235521, ['192.168.0.1']
+    ):
+        with pytest.raises(ValueError) as excinfo:
+            inputs.Validation.check_ip4(None, fattr, value)
+        assert str(excinfo.value).startswith(
+            f"mgmt_gateway: invalid ip4 address {value} "
+        )
+
+
 # ParamDictItemInputBase tests
 
 
@@ -750,6 +852,93 @@ def test_inputs_SWUpdateRepo_is_apis(tmpdir_function):
     _check('is_remote')
 
 
+def test_inputs_SWUpdateRepo_source_kind(tmpdir_function, mocker):
+    repo_path = tmpdir_function / 'repo.iso'
+    repo_path.touch()
+
+    res = SWUpdateRepo('1.2.3', source=repo_path)
+
+    stat_m = mocker.spy(inputs.os, 'stat')
+    assert res.pillar_value == 'iso'
+    assert stat_m.call_count == 1
+
+    # the current file system state is checked each time
+    repo_path.unlink()
+    repo_path.mkdir()
+    assert res.is_dir() and not res.is_iso()
+    assert res.pillar_value == 'dir'
+
+    res.source = UNDEFINED
+    assert res.is_special() and not res.is_local()
+    assert res.pillar_value is UNDEFINED
+
+
+def test_inputs_SWUpdateRepo_source_kind_errors(tmpdir_function, mocker):
+    res = SWUpdateRepo('1.2.3', source=tmpdir_function)
+
+    mocker.patch.object(
+        inputs.os, 'stat', autospec=True, side_effect=PermissionError
+    )
+    with pytest.raises(PermissionError):
+        res.is_dir()
+
+
+def test_inputs_SWUpdateRepo_serialized():
+    res = SWUpdateRepo('1.2.3', source='http://some/http/url')
+    assert res.is_remote()
+
+    assert json.loads(serialize.dumps(res))['kwargs'] == res.__dict__
+
+
+# ### SWUpgradeRepo ###
+
+def test_inputs_SWUpgradeRepo_pillar_values():
+    res = SWUpgradeRepo('http://some/http/url', release='1.2.3-4')
+    res.target_build = '/some/base/dir'
+    res.enabled = True
+
+    values_ver1 = res._pillar_values_ver1
+    assert values_ver1[config.CORTX_ISO_DIR] == {
+        'source': f'file:///some/base/dir/1.2.3-4/{config.CORTX_ISO_DIR}',
+        'is_repo': True,
+        'enabled': True
+    }
+    # a new map each time
+    assert res._pillar_values_ver1 is not values_ver1
+
+    # attributes assigned after init are respected
+    res.enabled = False
+    res.target_build = '/other/base/dir'
+    assert res._pillar_values_ver1[config.CORTX_ISO_DIR] == {
+        'source': f'file:///other/base/dir/1.2.3-4/{config.CORTX_ISO_DIR}',
+        'is_repo': True,
+        'enabled': False
+    }
+
+
+# ### SWUpgradeRemoveRepo ###
+
+def test_inputs_SWUpgradeRemoveRepo_release_validation():
+    assert SWUpgradeRemoveRepo('1.2.3-4').release == '1.2.3-4'
+
+    for release in ('1.2.3', '1.2.3-4\n', 'v1.2.3-4', '1.2.3-4-5'):
+        with pytest.raises(ValueError):
+            SWUpgradeRemoveRepo(release)
+
+
+def test_inputs_SWUpgradeRemoveRepo_pillar_value():
+    res = SWUpgradeRemoveRepo('1.2.3-4')
+    assert res.pillar_value == {
+        config.OS_ISO_DIR: None,
+        config.CORTX_ISO_DIR: None,
+        config.CORTX_3RD_PARTY_ISO_DIR: None,
+        config.CORTX_PYTHON_ISO_DIR: None,
+        '1.2.3-4': None
+    }
+    # a new dict is returned each time
+    assert res.pillar_value is not res.pillar_value
+
+
 def test_inputs_copy_attr_verify_attrs():
     some_cls = attr.make_class("some_cls", {
         "some_attr": attr.ib(
@@ -860,6 +1049,87 @@ def test_ParserFiller_fill_parser_input_checks(mocker):
     assert add_args_m.call_count == len(expected_calls)
 
 
+def test_ParserFiller_prepare_args_cached(mocker):
+    SC = attr.make_class("SC", {
+        "y": attr.ib(
+            default=123,
+            metadata={
+                METADATA_ARGPARSER: {
+                    'help': 'some help'
+                }
+            },
+            type=int
+        )
+    })
+    _prepare_args_m = mocker.spy(ParserFiller, '_prepare_args')
+
+    res = ParserFiller.prepare_args(SC)
+    assert res['--y']['help'] == 'some help'
+    res['--y']['help'] = 'changed help'
+
+    assert ParserFiller.prepare_args(SC)['--y']['help'] == 'some help'
+    _prepare_args_m.assert_called_once_with(SC, AttrParserArgs)
+
+    ParserFiller.prepare_args(SC, InputAttrParserArgs)
+    assert _prepare_args_m.call_count == 2
+
+
+def test_ParserFiller_factory_defaults_not_shared():
+    SC = attr.make_class("SC", {
+        "x": attr.ib(
+            default=attr.Factory(list),
+            metadata={
+                METADATA_ARGPARSER: {
+                    'help': 'some help',
+                    'nargs': '*'
+                }
+            },
+            type=List
+        )
+    })
+
+    parser1 = argparse.ArgumentParser()
+    ParserFiller.fill_parser(SC, parser1)
+    parser2 = argparse.ArgumentParser()
+    ParserFiller.fill_parser(SC, parser2)
+
+    args1 = parser1.parse_args([])
+    args2 = parser2.parse_args([])
+    assert args1.x == args2.x == []
+    assert args1.x is not args2.x
+
+    args1.x.append('some-value')
+    assert parser2.parse_args([]).x == []
+    assert ParserFiller.prepare_args(SC)['--x']['default'] == []
+
+
+def test_ParserFiller_mutable_defaults_not_shared():
+    SC = attr.make_class("SC", {
+        "x": attr.ib(
+            default=[],
+            metadata={
+                METADATA_ARGPARSER: {
+                    'help': 'some help',
+                    'nargs': '*'
+                }
+            },
+            type=List
+        )
+    })
+
+    parser1 = argparse.ArgumentParser()
+    ParserFiller.fill_parser(SC, parser1)
+    parser2 = argparse.ArgumentParser()
+    ParserFiller.fill_parser(SC, parser2)
+
+    args1 = parser1.parse_args([])
+    args1.x.append('some-value')
+
+    assert parser2.parse_args([]).x == []
+    assert ParserFiller.prepare_args(SC)['--x']['default'] == []
+    assert attr.fields(SC).x.default == []
+
+
 @pytest.mark.outdated
 def test_ParserFiller_extract_positional_args_happy_path():
     SC = attr.make_class("SC", {
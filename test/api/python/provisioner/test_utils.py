@@ -216,7 +216,7 @@ def test_load_yaml_str_raises_exception(mocker, patch_logging):
     data = 'some-data'
 
     mocker.patch.object(
-        utils.yaml, 'safe_load',
+        utils.yaml, 'load',
         autospec=True, side_effect=yaml.YAMLError
     )
 
@@ -227,10 +227,10 @@ def test_load_yaml_str_raises_exception(mocker, patch_logging):
 def test_load_yaml_str_input_check(mocker):
     data = 'some-data'
 
-    run_m = mocker.patch.object(utils.yaml, 'safe_load', autospec=True)
+    run_m = mocker.patch.object(utils.yaml, 'load', autospec=True)
     utils.load_yaml_str(data)
 
-    run_m.assert_called_once_with(data)
+    run_m.assert_called_once_with(data, Loader=utils.YamlSafeLoader)
 
 
 def test_load_yaml_str_output_check(mocker):
@@ -238,7 +238,7 @@ def test_load_yaml_str_output_check(mocker):
     out_data = 'some-out-data'
 
     mocker.patch.object(
-        utils.yaml, 'safe_load', autospec=True, return_value=out_data
+        utils.yaml, 'load', autospec=True, return_value=out_data
     )
 
     assert utils.load_yaml_str(in_data) == out_data